@@ -1,5 +1,6 @@
 from typing import Tuple
 
+import jax
 import jax.numpy as jnp
 import numpy as np
 
@@ -39,40 +40,57 @@ def aggregate_marg_utils_and_exp_values(
             of the state-specific aggregate expected values.
 
     """
-    choice_values_per_state = jnp.take(
-        value_state_choice_specific,
-        reshape_state_choice_vec_to_mat,
-        axis=0,
-        mode="fill",
-        fill_value=jnp.nan,
+    # Index entries beyond the state-choice axis mark choices which are not in the
+    # choice set of the child state. We mask them once instead of relying on the
+    # nan-aware reductions, which XLA can not fuse. The indexer comes in the smallest
+    # unsigned integer dtype, which might not hold the number of state choices. We
+    # therefore compare against the largest valid index, capped at the maximum of the
+    # dtype, which needs no cast.
+    max_valid_idx = min(
+        value_state_choice_specific.shape[0] - 1,
+        jnp.iinfo(reshape_state_choice_vec_to_mat.dtype).max,
     )
-
-    (
-        choice_probs,
-        max_value_per_state,
-        sum_exp,
-    ) = calculate_choice_probs_and_unsqueezed_logsum(
-        choice_values_per_state=choice_values_per_state,
-        taste_shock_scale=taste_shock_scale,
+    choice_set_mask = expand_choice_set_mask(
+        choice_set_mask=reshape_state_choice_vec_to_mat <= max_valid_idx,
+        n_dims=value_state_choice_specific.ndim + 1,
     )
 
-    log_sum_unsqueezed = max_value_per_state + taste_shock_scale * jnp.log(sum_exp)
-
-    # Because we kept the dimensions in the maximum and sum over choice specific objects
-    # to perform subtraction and division, we now need to squeeze the log_sum again
-    # to remove the redundant axis.
-    log_sum = jnp.squeeze(log_sum_unsqueezed, axis=1)
-
-    choice_marg_util_per_state = jnp.take(
-        marg_util_state_choice_specific,
+    # Values and marginal utilities share the same indexer, so we gather both of them
+    # with a single take. Infeasible choices are handled by the mask, so we can clamp
+    # their indexes instead of filling. The mask is the only guard against these
+    # clamped entries, which is why it is computed in a wide integer dtype above.
+    choice_values_per_state, choice_marg_util_per_state = jnp.take(
+        jnp.stack((value_state_choice_specific, marg_util_state_choice_specific)),
         reshape_state_choice_vec_to_mat,
-        axis=0,
-        mode="fill",
-        fill_value=jnp.nan,
+        axis=1,
+        mode="clip",
     )
 
-    weighted_marg_util = choice_probs * choice_marg_util_per_state
-    marg_util = jnp.nansum(weighted_marg_util, axis=1)
+    # The log-sum and the choice probabilities are computed in a single fused
+    # log-sum-exp reduction. Infeasible choices enter with a value of minus infinity,
+    # so they get zero probability.
+    scaled_choice_values = jnp.where(
+        choice_set_mask, choice_values_per_state / taste_shock_scale, -jnp.inf
+    )
+    # States without any feasible choice only exist as padding of uneven batches. A
+    # row of minus infinity is not safe to differentiate in the log-sum-exp, so we
+    # replace it by a finite sentinel before the reduction and reset the log-sum
+    # afterwards. Their marginal utility is masked to zero below.
+    has_feasible_choice = jnp.any(choice_set_mask, axis=1, keepdims=True)
+    scaled_choice_values = jnp.where(has_feasible_choice, scaled_choice_values, 0)
+    scaled_log_sum = jax.nn.logsumexp(scaled_choice_values, axis=1, keepdims=True)
+    scaled_log_sum = jnp.where(has_feasible_choice, scaled_log_sum, 0)
+    choice_probs = jnp.exp(scaled_choice_values - scaled_log_sum)
+
+    # Because we kept the dimensions in the log-sum over choice specific objects to
+    # compute the choice probabilities, we now need to squeeze it again to remove the
+    # redundant axis.
+    log_sum = taste_shock_scale * jnp.squeeze(scaled_log_sum, axis=1)
+
+    marg_util = jnp.sum(
+        jnp.where(choice_set_mask, choice_probs * choice_marg_util_per_state, 0),
+        axis=1,
+    )
 
     shock_integrated_marg_util = marg_util @ income_shock_weights
     shock_integrated_log_sum = log_sum @ income_shock_weights
@@ -80,16 +98,65 @@ def aggregate_marg_utils_and_exp_values(
     return shock_integrated_marg_util, shock_integrated_log_sum
 
 
+def expand_choice_set_mask(choice_set_mask: jnp.ndarray, n_dims: int) -> jnp.ndarray:
+    """Append trailing axes to the (n_states, n_choices) mask for broadcasting."""
+    return choice_set_mask.reshape(
+        choice_set_mask.shape + (1,) * (n_dims - choice_set_mask.ndim)
+    )
+
+
 def calculate_choice_probs_and_unsqueezed_logsum(
     choice_values_per_state: jnp.ndarray, taste_shock_scale: float
 ) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
-    max_value_per_state = jnp.nanmax(choice_values_per_state, axis=1, keepdims=True)
+    """Compute choice probabilities and the components of the log-sum.
+
+    Choices outside the choice set of a state have a NaN value. They keep a NaN
+    choice probability, so that an observed choice outside the choice set shows up
+    as NaN in the likelihood. The probabilities of the feasible choices sum up to
+    one. If all choices of a state are NaN, the maximum value is minus infinity, the
+    sum of exponentials is zero and all choice probabilities are NaN.
+
+    Args:
+        choice_values_per_state (jnp.ndarray): 2d array of shape
+            (n_states, n_choices) with the choice specific values.
+        taste_shock_scale (float): The taste shock scale.
 
-    rescale_values_per_state = choice_values_per_state - max_value_per_state
+    Returns:
+        tuple:
 
-    rescaled_exponential = jnp.exp(rescale_values_per_state / taste_shock_scale)
+        - choice_probs (jnp.ndarray): 2d array of shape (n_states, n_choices) with
+            the choice probabilities.
+        - max_value_per_state (jnp.ndarray): 2d array of shape (n_states, 1) with
+            the maximum value over the feasible choices.
+        - sum_exp (jnp.ndarray): 2d array of shape (n_states, 1) with the sum of
+            the rescaled exponentials of the feasible choice values.
 
-    sum_exp = jnp.nansum(rescaled_exponential, axis=1, keepdims=True)
-    choice_probs = rescaled_exponential / sum_exp
+    """
+    # Values of choices outside the choice set are NaN. We exclude them from the
+    # rescaling and set their exponential to zero. The untaken branches are kept
+    # finite, so that gradients do not become NaN. This includes states without any
+    # feasible choice, whose maximum is minus infinity and which we rescale by zero.
+    choice_set_mask = ~jnp.isnan(choice_values_per_state)
+    max_value_per_state = jnp.max(
+        jnp.where(choice_set_mask, choice_values_per_state, -jnp.inf),
+        axis=1,
+        keepdims=True,
+    )
+    has_feasible_choice = jnp.isfinite(max_value_per_state)
+
+    rescale_values_per_state = jnp.where(
+        choice_set_mask, choice_values_per_state, 0
+    ) - jnp.where(has_feasible_choice, max_value_per_state, 0)
+
+    rescaled_exponential = jnp.where(
+        choice_set_mask, jnp.exp(rescale_values_per_state / taste_shock_scale), 0
+    )
+
+    sum_exp = jnp.sum(rescaled_exponential, axis=1, keepdims=True)
+    choice_probs = jnp.where(
+        choice_set_mask,
+        rescaled_exponential / jnp.where(has_feasible_choice, sum_exp, 1),
+        jnp.nan,
+    )
 
     return choice_probs, max_value_per_state, sum_exp
@@ -159,15 +159,17 @@ def interp1d_value_and_marg_util_for_state_choice(
 
         return value_interp, marg_util_interp
 
-    interp_over_single_wealth_and_income_shock_draw = vmap(
-        vmap(interp_on_single_wealth_point)  # income shocks
-    )  # wealth grid
-
-    value_interp, marg_util_interp = interp_over_single_wealth_and_income_shock_draw(
-        wealth_beginning_of_next_period
+    # The interpolation is independent for each wealth grid point and income shock
+    # draw. We therefore vectorize over the flattened wealth array once and restore
+    # the (n_grid_wealth, n_income_shocks) shape afterwards.
+    value_interp, marg_util_interp = vmap(interp_on_single_wealth_point)(
+        wealth_beginning_of_next_period.ravel()
     )
 
-    return value_interp, marg_util_interp
+    return (
+        value_interp.reshape(wealth_beginning_of_next_period.shape),
+        marg_util_interp.reshape(wealth_beginning_of_next_period.shape),
+    )
 
 
 def interp2d_value_and_marg_util_for_state_choice(
@@ -240,21 +242,19 @@ def interp2d_value_and_marg_util_for_state_choice(
 
         return value_interp, marg_util_interp
 
-    # Outer vmap applies first
-    interp_over_single_wealth_and_income_shock_draw = vmap(
-        vmap(
-            vmap(
-                interp_on_single_wealth_point,
-                in_axes=(0, None),  # income shocks
-            ),
-            in_axes=(0, None),  # wealth grid
-        ),
-        in_axes=(0, 0),  # continuous state grid
-    )
     # Old points: regular grid and endog grid
-    # New points: continuous state next period and wealth next period
-    value_interp, marg_util_interp = interp_over_single_wealth_and_income_shock_draw(
-        wealth_beginning_of_next_period, continuous_state_beginning_of_next_period
+    # New points: continuous state next period and wealth next period.
+    # Each continuous state grid point is broadcasted to all of its wealth levels
+    # and income shocks, so that we can interpolate all points with a single vmap.
+    continuous_state_broadcasted = jnp.broadcast_to(
+        continuous_state_beginning_of_next_period[:, None, None],
+        wealth_beginning_of_next_period.shape,
+    )
+    value_interp, marg_util_interp = vmap(interp_on_single_wealth_point)(
+        wealth_beginning_of_next_period.ravel(), continuous_state_broadcasted.ravel()
     )
 
-    return value_interp, marg_util_interp
+    return (
+        value_interp.reshape(wealth_beginning_of_next_period.shape),
+        marg_util_interp.reshape(wealth_beginning_of_next_period.shape),
+    )
@@ -2,29 +2,47 @@
 
 from typing import Callable, Dict, Tuple
 
-import numpy as np
 from jax import numpy as jnp
 from jax import vmap
 
 
 def calculate_candidate_solutions_from_euler_equation(
-    exog_grids: np.ndarray,
+    exog_grids: Dict[str, jnp.ndarray],
     marg_util_next: jnp.ndarray,
     emax_next: jnp.ndarray,
-    state_choice_mat: np.ndarray,
-    idx_post_decision_child_states: np.ndarray,
+    state_choice_mat: Dict[str, jnp.ndarray],
+    idx_post_decision_child_states: jnp.ndarray,
     model_funcs: Dict[str, Callable],
     has_second_continuous_state: bool,
     params: Dict[str, float],
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
     """Calculate candidates for the optimal policy and value function."""
 
-    feasible_marg_utils_child = jnp.take(
-        marg_util_next, idx_post_decision_child_states, axis=0
+    # Both arrays are read with identical indices, so gather them in one go. We keep
+    # them stacked in the leading axis, such that the integration over the exogenous
+    # processes is a single contraction.
+    feasible_marg_util_and_emax_child = jnp.take(
+        jnp.stack((marg_util_next, emax_next)), idx_post_decision_child_states, axis=1
     )
-    feasible_emax_child = jnp.take(emax_next, idx_post_decision_child_states, axis=0)
+
+    compute_exog_transition_vec = model_funcs["compute_exog_transition_vec"]
 
     if has_second_continuous_state:
+        # The transition probabilities do not vary over the savings grid. We therefore
+        # compute them once for each state-choice and continuous state grid point.
+        transition_vecs = vmap(
+            vmap(
+                calc_transition_vec_for_continuous_state,
+                in_axes=(None, 0, None, None),  # second continuous state
+            ),
+            in_axes=(0, None, None, None),  # discrete states choices
+        )(
+            state_choice_mat,
+            exog_grids["second_continuous"],
+            params,
+            compute_exog_transition_vec,
+        )
+
         (
             endog_grid,
             policy,
@@ -34,14 +52,14 @@ def calculate_candidate_solutions_from_euler_equation(
             vmap(
                 vmap(
                     compute_optimal_policy_and_value_wrapper,
-                    in_axes=(1, 1, None, 0, None, None, None),  # savings
+                    in_axes=(2, None, None, 0, None, None, None),  # savings
                 ),
-                in_axes=(1, 1, 0, None, None, None, None),  # second continuous state
+                in_axes=(2, 0, 0, None, None, None, None),  # second cont. state
             ),
-            in_axes=(0, 0, None, None, 0, None, None),  # discrete states choices
+            in_axes=(1, 0, None, None, 0, None, None),  # discrete states choices
         )(
-            feasible_marg_utils_child,
-            feasible_emax_child,
+            feasible_marg_util_and_emax_child,
+            transition_vecs,
             exog_grids["second_continuous"],
             exog_grids["wealth"],
             state_choice_mat,
@@ -49,6 +67,17 @@ def calculate_candidate_solutions_from_euler_equation(
             params,
         )
     else:
+        # The transition probabilities do not vary over the savings grid. We therefore
+        # compute them once for each state-choice.
+        transition_vecs = vmap(
+            calc_transition_vec,
+            in_axes=(0, None, None),  # states and choices
+        )(
+            state_choice_mat,
+            params,
+            compute_exog_transition_vec,
+        )
+
         (
             endog_grid,
             policy,
@@ -57,12 +86,12 @@ def calculate_candidate_solutions_from_euler_equation(
         ) = vmap(
             vmap(
                 compute_optimal_policy_and_value,
-                in_axes=(1, 1, 0, None, None, None),  # savings grid
+                in_axes=(2, None, 0, None, None, None),  # savings grid
             ),
-            in_axes=(0, 0, None, 0, None, None),  # states and choices
+            in_axes=(1, 0, None, 0, None, None),  # states and choices
         )(
-            feasible_marg_utils_child,
-            feasible_emax_child,
+            feasible_marg_util_and_emax_child,
+            transition_vecs,
             exog_grids["wealth"],
             state_choice_mat,
             model_funcs,
@@ -77,21 +106,42 @@ def calculate_candidate_solutions_from_euler_equation(
     )
 
 
+def calc_transition_vec(
+    state_choice_vec: Dict,
+    params: Dict[str, float],
+    compute_exog_transition_vec: Callable,
+) -> jnp.ndarray:
+    """Compute the exogenous transition vector of a state-choice combination."""
+    return compute_exog_transition_vec(params=params, **state_choice_vec)
+
+
+def calc_transition_vec_for_continuous_state(
+    state_choice_vec: Dict,
+    second_continuous_grid: jnp.ndarray,
+    params: Dict[str, float],
+    compute_exog_transition_vec: Callable,
+) -> jnp.ndarray:
+    """Compute the exogenous transition vector given a second continuous state."""
+    return compute_exog_transition_vec(
+        params=params, continuous_state=second_continuous_grid, **state_choice_vec
+    )
+
+
 def compute_optimal_policy_and_value_wrapper(
-    marg_util_next: np.ndarray,
-    emax_next: np.ndarray,
-    second_continuous_grid: np.ndarray,
-    exogenous_savings_grid: np.ndarray,
+    marg_util_and_emax_next: jnp.ndarray,
+    transition_vec: jnp.ndarray,
+    second_continuous_grid: jnp.ndarray,
+    exogenous_savings_grid: jnp.ndarray,
     state_choice_vec: Dict,
     model_funcs: Dict[str, Callable],
     params: Dict[str, float],
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
     """Write second continuous grid point into state_choice_vec."""
     state_choice_vec["continuous_state"] = second_continuous_grid
 
     return compute_optimal_policy_and_value(
-        marg_util_next,
-        emax_next,
+        marg_util_and_emax_next,
+        transition_vec,
         exogenous_savings_grid,
         state_choice_vec,
         model_funcs,
@@ -100,13 +150,13 @@ def compute_optimal_policy_and_value_wrapper(
 
 
 def compute_optimal_policy_and_value(
-    marg_util_next: np.ndarray,
-    emax_next: np.ndarray,
-    exogenous_savings_grid: np.ndarray,
+    marg_util_and_emax_next: jnp.ndarray,
+    transition_vec: jnp.ndarray,
+    exogenous_savings_grid: jnp.ndarray,
     state_choice_vec: Dict,
     model_funcs: Dict[str, Callable],
     params: Dict[str, float],
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
     """Compute optimal child-state- and choice-specific policy and value function.
 
     Given the marginal utilities of possible child states and next period wealth, we
@@ -114,17 +164,16 @@ def compute_optimal_policy_and_value(
     and using the optimal consumption level in the bellman equation.
 
     Args:
-        marg_utils (np.ndarray): 1d array of shape (n_exog_processes,) containing
-            the state-choice specific marginal utilities for a given point on
-            the savings grid.
-        emax (np.ndarray): 1d array of shape (n_exog_processes,) containing
-            the state-choice specific expected maximum value for a given point on
-            the savings grid.
-        exogenous_savings_grid (np.ndarray): 1d array of shape (n_grid_wealth,)
+        marg_util_and_emax_next (jnp.ndarray): 2d array of shape
+            (2, n_exog_processes) containing the state-choice specific marginal
+            utilities in the first and the expected maximum values in the second row
+            for a given point on the savings grid.
+        transition_vec (jnp.ndarray): 1d array of shape (n_exog_processes,)
+            containing for each exogenous process state the corresponding
+            transition probability.
+        exogenous_savings_grid (jnp.ndarray): 1d array of shape (n_grid_wealth,)
             containing the exogenous savings grid.
-        trans_vec_state (np.ndarray): 1d array of shape (n_exog_processes,) containing
-            for each exogenous process state the corresponding transition probability.
-        state_choice_vec (np.ndarray): A dictionary containing the states and a
+        state_choice_vec (dict): A dictionary containing the states and a
         corresponding admissible choice of a particular state choice vector.
         compute_inverse_marginal_utility (Callable): Function for calculating the
             inverse marginal utility, which takes the marginal utility as only input.
@@ -136,11 +185,11 @@ def compute_optimal_policy_and_value(
     Returns:
         tuple:
 
-        - endog_grid (np.ndarray): 1d array of shape (n_grid_wealth + 1,)
+        - endog_grid (jnp.ndarray): 1d array of shape (n_grid_wealth + 1,)
             containing the current state- and choice-specific endogenous grid.
-        - policy (np.ndarray): 1d array of shape (n_grid_wealth + 1,)
+        - policy (jnp.ndarray): 1d array of shape (n_grid_wealth + 1,)
             containing the current state- and choice-specific policy function.
-        - value (np.ndarray): 1d array of shape (n_grid_wealth + 1,)
+        - value (jnp.ndarray): 1d array of shape (n_grid_wealth + 1,)
             containing the current state- and choice-specific value function.
         - expected_value_zero_savings (float): The agent's expected value given that
             she saves nothing.
@@ -148,14 +197,12 @@ def compute_optimal_policy_and_value(
     """
     compute_inverse_marginal_utility = model_funcs["compute_inverse_marginal_utility"]
     compute_utility = model_funcs["compute_utility"]
-    compute_exog_transition_vec = model_funcs["compute_exog_transition_vec"]
 
     policy, expected_value = solve_euler_equation(
         state_choice_vec=state_choice_vec,
-        marg_util_next=marg_util_next,
-        emax_next=emax_next,
+        marg_util_and_emax_next=marg_util_and_emax_next,
+        transition_vec=transition_vec,
         compute_inverse_marginal_utility=compute_inverse_marginal_utility,
-        compute_exog_transition_vec=compute_exog_transition_vec,
         params=params,
     )
     endog_grid = exogenous_savings_grid + policy
@@ -168,26 +215,24 @@ def compute_optimal_policy_and_value(
 
 def solve_euler_equation(
     state_choice_vec: dict,
-    marg_util_next: np.ndarray,
-    emax_next: np.ndarray,
+    marg_util_and_emax_next: jnp.ndarray,
+    transition_vec: jnp.ndarray,
     compute_inverse_marginal_utility: Callable,
-    compute_exog_transition_vec: Callable,
     params: Dict[str, float],
-) -> Tuple[np.ndarray, np.ndarray]:
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
     """Solve the Euler equation for given discrete choice and child states.
 
     We integrate over the exogenous process and income uncertainty and
     then apply the inverese marginal utility function.
 
     Args:
-        marg_utils (np.ndarray): 1d array of shape (n_exog_processes,) containing
-            the state-choice specific marginal utilities for a given point on
-            the savings grid.
-        emax (np.ndarray): 1d array of shape (n_exog_processes,) containing
-            the state-choice specific expected maximum value for a given point on
-            the savings grid.
-        trans_vec_state (np.ndarray): 1d array of shape (n_exog_processes,) containing
-            for each exogenous process state the corresponding transition probability.
+        marg_util_and_emax_next (jnp.ndarray): 2d array of shape
+            (2, n_exog_processes) containing the state-choice specific marginal
+            utilities in the first and the expected maximum values in the second row
+            for a given point on the savings grid.
+        transition_vec (jnp.ndarray): 1d array of shape (n_exog_processes,)
+            containing for each exogenous process state the corresponding
+            transition probability.
         compute_inverse_marginal_utility (callable): Function for calculating the
             inverse marginal utility, which takes the marginal utility as only input.
             (n_exog_processes, n_grid_wealth) with the maximum values.
@@ -196,21 +241,21 @@ def solve_euler_equation(
     Returns:
         tuple:
 
-        - policy (np.ndarray): 1d array of the agent's current state- and
+        - policy (jnp.ndarray): 1d array of the agent's current state- and
             choice-specific consumption policy. Has shape (n_grid_wealth,).
-        - expected_value (np.ndarray): 1d array of the agent's current state- and
+        - expected_value (jnp.ndarray): 1d array of the agent's current state- and
             choice-specific expected value. Has shape (n_grid_wealth,).
 
     """
+    # Integrate out the uncertainty over exogenous processes for the marginal
+    # utilities and the maximum values in a single contraction with the shared
+    # transition vector.
+    marg_util_integrated, expected_value = jnp.nansum(
+        transition_vec * marg_util_and_emax_next, axis=1
+    )
 
-    transition_vec = compute_exog_transition_vec(params=params, **state_choice_vec)
-
-    # Integrate out uncertainty over exogenous processes
-    marginal_utility_next = jnp.nansum(transition_vec * marg_util_next)
-    expected_value = jnp.nansum(transition_vec * emax_next)
-
-    # RHS of Euler Eq., p. 337 IJRS (2017) by multiplying with marginal wealth
-    rhs_euler = marginal_utility_next * (1 + params["interest_rate"]) * params["beta"]
+    # RHS of Euler Eq., p. 337 IJRS (2017)
+    rhs_euler = marg_util_integrated * (1 + params["interest_rate"]) * params["beta"]
 
     policy = compute_inverse_marginal_utility(
         marginal_utility=rhs_euler,
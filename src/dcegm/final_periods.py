@@ -210,22 +210,24 @@ def solve_final_period_discrete(
     ]
     n_wealth = exog_grids["wealth"].shape[0]
 
+    # Flatten wealth and income shocks, such that we only need one vmap over all
+    # gridpoints of a state choice combination.
+    n_state_choices = wealth_child_states_final_period.shape[0]
     value, marg_util = vmap(
         vmap(
-            vmap(
-                calc_value_and_marg_util_for_each_gridpoint,
-                in_axes=(None, 0, None, None, None),  # income shocks
-            ),
-            in_axes=(None, 0, None, None, None),  # wealth
+            calc_value_and_marg_util_for_each_gridpoint,
+            in_axes=(None, 0, None, None, None),  # wealth and income shocks
         ),
         in_axes=(0, 0, None, None, None),  # discrete state choices
     )(
         state_choice_mat_final_period,
-        wealth_child_states_final_period,
+        wealth_child_states_final_period.reshape(n_state_choices, -1),
         params,
         compute_utility,
         compute_marginal_utility,
     )
+    value = value.reshape(wealth_child_states_final_period.shape)
+    marg_util = marg_util.reshape(wealth_child_states_final_period.shape)
     # Choose which draw we take for policy and value function as those are not
     # saved with respect to the draws
     middle_of_draws = int((value.shape[2] - 1) / 2)
@@ -300,26 +302,30 @@ def solve_final_period_second_continuous(
         idx_parent_states_final_period
     ]
 
+    # Broadcast the second continuous state to the wealth and income shock
+    # dimensions and flatten them, such that we only need one vmap over all
+    # gridpoints of a state choice combination.
+    n_state_choices = wealth_child_states_final_period.shape[0]
+    continuous_state_final = jnp.broadcast_to(
+        continuous_state_final[:, :, None, None],
+        wealth_child_states_final_period.shape,
+    )
     value, marg_util = vmap(
         vmap(
-            vmap(
-                vmap(
-                    calc_value_and_marg_util_for_each_gridpoint_second_continuous,
-                    in_axes=(None, 0, None, None, None, None),  # income shocks
-                ),
-                in_axes=(None, 0, None, None, None, None),  # wealth
-            ),
-            in_axes=(None, 0, 0, None, None, None),  # second continuous_state
+            calc_value_and_marg_util_for_each_gridpoint_second_continuous,
+            in_axes=(None, 0, 0, None, None, None),  # continuous states and shocks
         ),
         in_axes=(0, 0, 0, None, None, None),  # discrete state choices
     )(
         state_choice_mat_final_period,
-        wealth_child_states_final_period,
-        continuous_state_final,
+        wealth_child_states_final_period.reshape(n_state_choices, -1),
+        continuous_state_final.reshape(n_state_choices, -1),
         params,
         model_funcs["compute_utility_final"],
         model_funcs["compute_marginal_utility_final"],
     )
+    value = value.reshape(wealth_child_states_final_period.shape)
+    marg_util = marg_util.reshape(wealth_child_states_final_period.shape)
 
     # For the value to save in the second continuous case, we calculate the value
     # at the exogenous wealth and second continuous points
@@ -1,3 +1,4 @@
+import jax.numpy as jnp
 from jax import vmap
 
 
@@ -57,23 +58,26 @@ def calculate_wealth(
     params,
     compute_beginning_of_period_wealth,
 ):
+    # Evaluate all combinations of savings and income shocks with a single vmap
+    savings_mesh, income_shocks_mesh = jnp.meshgrid(
+        savings_grid, income_shocks_current_period, indexing="ij"
+    )
     wealth_beginning_of_period = vmap(
         vmap(
-            vmap(
-                calc_wealth_for_each_savings_grid_point,
-                in_axes=(None, None, 0, None, None),  # income shocks
-            ),
-            in_axes=(None, 0, None, None, None),  # savings
+            calc_wealth_for_each_savings_grid_point,
+            in_axes=(None, 0, 0, None, None),  # savings and income shocks
         ),
         in_axes=(0, None, None, None, None),  # discrete states
     )(
         discrete_states_beginning_of_period,
-        savings_grid,
-        income_shocks_current_period,
+        savings_mesh.ravel(),
+        income_shocks_mesh.ravel(),
         params,
         compute_beginning_of_period_wealth,
     )
-    return wealth_beginning_of_period
+    return wealth_beginning_of_period.reshape(
+        wealth_beginning_of_period.shape[0], *savings_mesh.shape
+    )
 
 
 def calc_wealth_for_each_savings_grid_point(
@@ -161,27 +165,32 @@ def calculate_wealth_for_second_continuous_state(
     compute_beginning_of_period_wealth,
 ):
 
+    # Evaluate all combinations of continuous states, savings and income shocks
+    # with a single vmap
+    n_states, n_continuous = continuous_state_beginning_of_next_period.shape
+    grid_shape = (n_continuous, savings_grid.shape[0], income_shocks.shape[0])
+    continuous_state_mesh = jnp.broadcast_to(
+        continuous_state_beginning_of_next_period[:, :, None, None],
+        (n_states,) + grid_shape,
+    )
+    savings_mesh = jnp.broadcast_to(savings_grid[None, :, None], grid_shape)
+    income_shocks_mesh = jnp.broadcast_to(income_shocks[None, None, :], grid_shape)
+
     wealth_beginning_of_period = vmap(
         vmap(
-            vmap(
-                vmap(
-                    calc_wealth_for_each_continuous_state_and_savings_grid_point,
-                    in_axes=(None, None, None, 0, None, None),  # income shocks
-                ),
-                in_axes=(None, None, 0, None, None, None),  # savings
-            ),
-            in_axes=(None, 0, None, None, None, None),  # continuous state
+            calc_wealth_for_each_continuous_state_and_savings_grid_point,
+            in_axes=(None, 0, 0, 0, None, None),  # continuous states, savings, shocks
         ),
         in_axes=(0, 0, None, None, None, None),  # discrete states
     )(
         discrete_states_beginning_of_next_period,
-        continuous_state_beginning_of_next_period,
-        savings_grid,
-        income_shocks,
+        continuous_state_mesh.reshape(n_states, -1),
+        savings_mesh.ravel(),
+        income_shocks_mesh.ravel(),
         params,
         compute_beginning_of_period_wealth,
     )
-    return wealth_beginning_of_period
+    return wealth_beginning_of_period.reshape((n_states,) + grid_shape)
 
 
 # =====================================================================================
@@ -62,7 +62,9 @@ def create_individual_likelihood_function_for_model(
             params_in=params_update,
         )
         # Negative ll contributions are positive numbers. The smaller the better the fit
-        # Add high fixed punishment for not explained choices
+        # Add high fixed punishment for not explained choices. Observed choices outside
+        # the choice set of the observed state have a NaN probability, which is not
+        # clipped, so that such data errors remain visible.
         neg_likelihood_contributions = (-jnp.log(choice_probs)).clip(max=999)
 
         if return_model_solution:
@@ -167,7 +169,9 @@ def create_choice_prob_func_unobserved_states(
     n_obs = len(observed_choices)
 
     def choice_prob_func(value_in, endog_grid_in, params_in):
-        choice_probs_final = jnp.zeros(n_obs, dtype=jnp.float64)
+        choice_probs_final = jnp.zeros(
+            n_obs, dtype=jax.dtypes.canonicalize_dtype(jnp.float64)
+        )
         for partial_choice_prob, unobserved_state, weighting_vars in zip(
             partial_choice_probs_unobserved_states,
             possible_states,
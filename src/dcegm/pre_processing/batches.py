@@ -1,5 +1,7 @@
 import numpy as np
 
+from dcegm.pre_processing.state_space import get_smallest_int_type
+
 
 def create_batches_and_information(
     model_structure,
@@ -106,12 +108,14 @@ def create_batches_and_information(
         last_idx_to_aggregate_choice = child_state_choices_to_aggr_choice_list[-1]
         last_child_state_idx_interp = child_state_choice_idxs_to_interp_list[-1]
 
+        state_choice_rows = state_choice_space[last_batch]
         last_state_choices = {
-            key: state_choice_space[:, i][last_batch]
+            key: state_choice_rows[..., i]
             for i, key in enumerate(discrete_states_names + ["choice"])
         }
+        state_choice_rows = state_choice_space[last_child_state_idx_interp]
         last_state_choices_childs = {
-            key: state_choice_space[:, i][last_child_state_idx_interp]
+            key: state_choice_rows[..., i]
             for i, key in enumerate(discrete_states_names + ["choice"])
         }
         last_parent_state_idx_of_state_choice = map_state_choice_to_parent_state[
@@ -138,11 +142,12 @@ def create_batches_and_information(
         ]
 
     # First convert batch information
-    batch_array = np.array(batches_list)
-    child_states_to_integrate_exog = np.array(child_states_to_integrate_exog_list)
+    batch_array = np.stack(batches_list)
+    child_states_to_integrate_exog = np.stack(child_states_to_integrate_exog_list)
 
+    state_choice_rows = state_choice_space[batch_array]
     state_choices_batches = {
-        key: state_choice_space[:, i][batch_array]
+        key: state_choice_rows[..., i]
         for i, key in enumerate(discrete_states_names + ["choice"])
     }
 
@@ -161,8 +166,9 @@ def create_batches_and_information(
     parent_state_idx_of_state_choice = map_state_choice_to_parent_state[
         child_state_choice_idxs_to_interp
     ]
+    state_choice_rows = state_choice_space[child_state_choice_idxs_to_interp]
     state_choices_childs = {
-        key: state_choice_space[:, i][child_state_choice_idxs_to_interp]
+        key: state_choice_rows[..., i]
         for i, key in enumerate(discrete_states_names + ["choice"])
     }
 
@@ -231,38 +237,46 @@ def extend_child_state_choices_to_aggregate_choices(
 
     # Now span an array with n_states times the maximum number of child states across
     # all batches and the number of choices. Fill with invalid state choice index
-    n_batches = len(idx_to_aggregate_choice)
-    max_n_child_states = np.max(max_n_state_unique_in_batches)
-    n_choices = idx_to_aggregate_choice[0].shape[1]
-    child_state_choices_to_aggr_choice = np.full(
-        (n_batches, max_n_child_states, n_choices),
+    child_state_choices_to_aggr_choice = stack_with_padding(
+        arrays=idx_to_aggregate_choice,
         fill_value=out_of_bounds_state_choice_idx,
-        dtype=int,  # what about this hard-coded int here?
     )
 
-    for id_batch in range(n_batches):
-        child_state_choices_to_aggr_choice[
-            id_batch, : max_n_state_unique_in_batches[id_batch], :
-        ] = idx_to_aggregate_choice[id_batch]
-
     # The second array are the state choice indexes in the child states. As child
     # states can have different admissible state choices this can be different in
     # each batch. We fill up with invalid numbers.
-    max_child_state_choices = np.max(list(map(len, idx_to_interpolate)))
     dummy_state = idx_to_interpolate[0][0]
-    child_state_choice_idxs_to_interp = np.full(
-        (n_batches, max_child_state_choices),
+    child_state_choice_idxs_to_interp = stack_with_padding(
+        arrays=idx_to_interpolate,
         fill_value=dummy_state,
-        dtype=int,
     )
-    for id_batch in range(n_batches):
-        child_state_choice_idxs_to_interp[
-            id_batch, : len(idx_to_interpolate[id_batch])
-        ] = idx_to_interpolate[id_batch]
 
     return child_state_choice_idxs_to_interp, child_state_choices_to_aggr_choice
 
 
+def stack_with_padding(arrays, fill_value):
+    """Stack arrays of different length along a new first axis.
+
+    The arrays are padded at the end of their first axis with fill_value to the
+    length of the longest array. Instead of looping over the arrays, all entries
+    are written into the padded array with a single scatter. The stacked array has
+    the smallest unsigned integer dtype which holds all entries and the fill value.
+
+    """
+    lengths = np.array([array.shape[0] for array in arrays])
+    max_value = max(fill_value, *(array.max(initial=0) for array in arrays))
+    stacked = np.full(
+        (len(arrays), lengths.max(), *arrays[0].shape[1:]),
+        fill_value=fill_value,
+        dtype=get_smallest_int_type(max_value),
+    )
+    array_ids = np.repeat(np.arange(len(arrays)), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    row_ids = np.arange(lengths.sum()) - np.repeat(offsets, lengths)
+    stacked[array_ids, row_ids] = np.concatenate(arrays, axis=0)
+    return stacked
+
+
 def add_last_two_period_information(
     n_periods,
     state_choice_space,
@@ -273,29 +287,36 @@ def add_last_two_period_information(
     state_space,
     batch_info,
 ):
+    # The state and state choice space are sorted by period. The last two periods
+    # are therefore contiguous blocks at the end, which we find by binary search.
+    start_second_last_period, start_final_period = np.searchsorted(
+        state_choice_space[:, 0], [n_periods - 2, n_periods - 1]
+    )
     # Select state_choice idxs in final period
-    idx_state_choice_final_period = np.where(state_choice_space[:, 0] == n_periods - 1)[
-        0
-    ]
+    idx_state_choice_final_period = np.arange(
+        start_final_period, state_choice_space.shape[0]
+    )
     # To solve the second last period, we need the child states in the last period
     # and the corresponding matrix, where each row is a state with the state choice
     # ids as entry in each choice
-    idx_states_final_period = np.where(state_space[:, 0] == n_periods - 1)[0]
+    idx_states_final_period = np.arange(
+        np.searchsorted(state_space[:, 0], n_periods - 1), state_space.shape[0]
+    )
     states_final_period = state_space[idx_states_final_period]
-    # Now construct a tuple for indexing
-    n_state_vars = states_final_period.shape[1]
-    states_tuple = tuple(states_final_period[:, i] for i in range(n_state_vars))
 
     # Now get the matrix we use for choice aggregation
-    state_to_choices_final_period = map_state_choice_to_index[states_tuple]
+    state_to_choices_final_period = take_state_choice_idxs_of_states(
+        map_state_choice_to_index=map_state_choice_to_index,
+        states=states_final_period,
+    )
 
     # Reindex the state choices in the final period, to have them starting at 0.
     min_val = int(np.min(idx_state_choice_final_period))
     state_to_choices_final_period -= min_val
 
-    idx_state_choice_second_last_period = np.where(
-        state_choice_space[:, 0] == n_periods - 2
-    )[0]
+    idx_state_choice_second_last_period = np.arange(
+        start_second_last_period, start_final_period
+    )
     # Also normalize the state choice idxs
     child_states_second_last_period = map_state_choice_to_child_states[
         idx_state_choice_second_last_period
@@ -323,8 +344,9 @@ def add_last_two_period_information(
         (idx_state_choice_final_period, "final"),
         (idx_state_choice_second_last_period, "second_last"),
     ]:
+        state_choice_rows = state_choice_space[idx]
         batch_info[f"state_choice_mat_{period_name}_period"] = {
-            key: state_choice_space[:, i][idx]
+            key: state_choice_rows[..., i]
             for i, key in enumerate(discrete_states_names + ["choice"])
         }
     return batch_info
@@ -351,14 +373,17 @@ def determine_optimal_batch_size(
     # Order by child index to solve state choices in the same child states together
     sort_index_by_child_states = np.argsort(child_states_idx_backward[:, 0])
 
+    n_state_choices_wo_last_two = state_choice_space_wo_last_two.shape[0]
     state_choice_index_raw = np.arange(
-        state_choice_space_wo_last_two.shape[0], dtype=int
+        n_state_choices_wo_last_two,
+        dtype=get_smallest_int_type(n_state_choices_wo_last_two),
     )
     state_choice_index_back = np.take(
         state_choice_index_raw, sort_index_by_child_states, axis=0
     )
-
-    n_state_vars = state_space.shape[1]
+    # Batches are formed from the back. Reverse once into a contiguous array, so the
+    # batches split off in the retry loop are forward-strided views.
+    state_choice_index_back = np.ascontiguousarray(state_choice_index_back[::-1])
 
     size_last_period = state_choice_space[
         state_choice_space[:, 0] == state_choice_space_wo_last_two[-1, 0]
@@ -380,14 +405,13 @@ def determine_optimal_batch_size(
             current_batch_size,
         )
 
-        batches_to_check = np.split(
-            np.flip(state_choice_index_back),
-            index_to_spilt,
-        )
+        batches_to_check = np.split(state_choice_index_back, index_to_spilt)
 
-        child_states_to_integrate_exog = []
-        child_state_choices_to_aggr_choice = []
-        child_state_choice_idxs_to_interpolate = []
+        # The number of batches is known, so we fill preallocated lists by index.
+        n_batches = len(batches_to_check)
+        child_states_to_integrate_exog = [None] * n_batches
+        child_state_choices_to_aggr_choice = [None] * n_batches
+        child_state_choice_idxs_to_interpolate = [None] * n_batches
 
         for i, batch in enumerate(batches_to_check):
             # First get all child states and a mapping from the state-choice to the
@@ -396,19 +420,27 @@ def determine_optimal_batch_size(
             unique_child_states, inverse_ids = np.unique(
                 child_states_idxs, return_index=False, return_inverse=True
             )
-            child_states_to_integrate_exog += [
-                inverse_ids.reshape(child_states_idxs.shape)
-            ]
+            child_states_to_integrate_exog[i] = inverse_ids.reshape(
+                child_states_idxs.shape
+            )
 
             # Next we use the child state indexes to get all unique child states and
             # their corresponding state-choices.
             child_states_batch = np.take(state_space, unique_child_states, axis=0)
-            child_states_tuple = tuple(
-                child_states_batch[:, i] for i in range(n_state_vars)
+            unique_state_choice_idxs_childs = take_state_choice_idxs_of_states(
+                map_state_choice_to_index=map_state_choice_to_index,
+                states=child_states_batch,
             )
-            unique_state_choice_idxs_childs = map_state_choice_to_index[
-                child_states_tuple
-            ]
+
+            # Now check if the smallest index of the child state choices is larger than
+            # the maximum index of the batch, i.e. if all state choice relevant to
+            # solve the current state choices of the batch are in previous batches.
+            # Invalid state choices carry the maximum integer, so they never attain
+            # the minimum. We check this before building the aggregation mapping, to
+            # not waste work on batch sizes we discard.
+            if batch.max() >= np.min(unique_state_choice_idxs_childs):
+                need_to_reduce_batchsize = True
+                break
 
             # Now we create a mapping from the child-state choices back to the states
             # with state-choices in columns for the choices
@@ -428,22 +460,13 @@ def determine_optimal_batch_size(
                 ] = out_of_bounds_state_choice_idx
 
             # Save the mapping from child-state-choices to child-states
-            child_state_choices_to_aggr_choice += [
+            child_state_choices_to_aggr_choice[i] = (
                 inverse_child_state_choice_ids.reshape(
                     unique_state_choice_idxs_childs.shape
                 )
-            ]
+            )
             # And the list of the unique child states.
-            child_state_choice_idxs_to_interpolate += [unique_child_state_choice_idxs]
-
-            # Now check if the smallest index of the child state choices is larger than
-            # the maximum index of the batch, i.e. if all state choice relevant to
-            # solve the current state choices of the batch are in previous batches
-            min_state_choice_idx = np.min(unique_child_state_choice_idxs)
-            if batch.max() >= min_state_choice_idx:
-                batch_not_found = True
-                need_to_reduce_batchsize = True
-                break
+            child_state_choice_idxs_to_interpolate[i] = unique_child_state_choice_idxs
 
         print("The batch size of the backwards induction is ", current_batch_size)
 
@@ -456,3 +479,24 @@ def determine_optimal_batch_size(
         child_state_choices_to_aggr_choice,
         child_states_to_integrate_exog,
     )
+
+
+def take_state_choice_idxs_of_states(map_state_choice_to_index, states):
+    """Look up the state choice indexes of all choices for each state.
+
+    The state dimensions of the indexer are flattened, such that we can gather with
+    a single 1d index instead of multidimensional fancy indexing.
+
+    Args:
+        map_state_choice_to_index (np.ndarray): Indexer of shape
+            (n_poss_states_state_var_1, ..., n_choices).
+        states (np.ndarray): 2d array of shape (n_states, n_state_vars).
+
+    Returns:
+        np.ndarray: 2d array of shape (n_states, n_choices) with the state choice
+            indexes.
+
+    """
+    state_dims = map_state_choice_to_index.shape[: states.shape[1]]
+    flat_state_idxs = np.ravel_multi_index(tuple(states.T), state_dims)
+    return map_state_choice_to_index.reshape(np.prod(state_dims), -1)[flat_state_idxs]
@@ -35,6 +35,12 @@ def inspect_state_space(
 
     states_names_without_exog = ["period", "lagged_choice"] + endog_states_names
 
+    # The endogenous state combinations only depend on their id. Select them once
+    # instead of in every iteration of the loops below.
+    endog_states_by_id = [
+        add_endog_state_func(endog_state_id) for endog_state_id in range(n_endog_states)
+    ]
+
     state_space_wo_exog_list = []
     is_feasible_list = []
 
@@ -42,7 +48,7 @@ def inspect_state_space(
         for endog_state_id in range(n_endog_states):
             for lagged_choice in range(n_choices):
                 # Select the endogenous state combination
-                endog_states = add_endog_state_func(endog_state_id)
+                endog_states = endog_states_by_id[endog_state_id]
 
                 # Create the state vector without the exogenous processes
                 state_without_exog = [period, lagged_choice] + endog_states
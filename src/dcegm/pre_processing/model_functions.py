@@ -315,8 +315,10 @@ def _return_policy_and_value(
     n_nans = int(0.2 * endog_grid.shape[0])
 
     nans_to_append = jnp.full(n_nans - 1, jnp.nan)
-    endog_grid = jnp.append(jnp.append(0, endog_grid), nans_to_append)
-    policy = jnp.append(jnp.append(0, policy), nans_to_append)
-    value = jnp.append(jnp.append(expected_value_zero_savings, value), nans_to_append)
+    endog_grid = jnp.concatenate((jnp.zeros(1), endog_grid, nans_to_append))
+    policy = jnp.concatenate((jnp.zeros(1), policy, nans_to_append))
+    value = jnp.concatenate(
+        (jnp.atleast_1d(expected_value_zero_savings), value, nans_to_append)
+    )
 
     return endog_grid, policy, value
@@ -18,6 +18,10 @@ def process_params(params: Union[dict, pd.Series, pd.DataFrame]) -> Dict[str, fl
 
     """
 
+    # Extract pandas objects once, so that no .loc lookups end up in the solution.
+    if isinstance(params, (pd.Series, pd.DataFrame)):
+        params = _convert_params_to_dict(params)
+
     if "interest_rate" not in params:
         params["interest_rate"] = 0
     if "lambda" not in params:
@@ -28,3 +32,26 @@ def process_params(params: Union[dict, pd.Series, pd.DataFrame]) -> Dict[str, fl
         raise ValueError("beta must be provided in params.")
 
     return params
+
+
+def _convert_params_to_dict(params: Union[pd.Series, pd.DataFrame]) -> Dict[str, float]:
+    """Convert params Series or DataFrame with a value column to a dictionary.
+
+    In case of a MultiIndex, e.g. ("category", "name"), the last index level is used
+    as parameter name. Parameter names therefore have to be unique across categories.
+
+    """
+    if isinstance(params, pd.DataFrame):
+        params = params["value"]
+
+    if isinstance(params.index, pd.MultiIndex):
+        params = params.droplevel(list(range(params.index.nlevels - 1)))
+
+    if params.index.duplicated().any():
+        duplicated_names = sorted(set(params.index[params.index.duplicated()]))
+        raise ValueError(
+            f"The parameter names {duplicated_names} appear more than once in params. "
+            "Parameter names have to be unique, also across categories."
+        )
+
+    return params.to_dict()
@@ -109,7 +109,8 @@ def setup_and_save_model(
         "model_structure": model["model_structure"],
         "batch_info": model["batch_info"],
     }
-    pickle.dump(dict_to_save, open(path, "wb"))
+    with open(path, "wb") as file:
+        pickle.dump(dict_to_save, file, protocol=pickle.HIGHEST_PROTOCOL)
 
     return model
 
@@ -124,7 +125,8 @@ def load_and_setup_model(
 ):
     """Load the model from file."""
 
-    model = pickle.load(open(path, "rb"))
+    with open(path, "rb") as file:
+        model = pickle.load(file)
 
     model["options"] = check_options_and_set_defaults(options)
 
@@ -167,33 +167,37 @@ def create_state_space(options):
     ) = process_exog_model_specifications(state_space_options=state_space_options)
     states_names_without_exog = ["period", "lagged_choice"] + endog_states_names
 
-    state_space_wo_exog_list = []
-
-    for period in range(n_periods):
-        for endog_state_id in range(n_endog_states):
-            for lagged_choice in range(n_choices):
-                # Select the endogenous state combination
-                endog_states = add_endog_state_func(endog_state_id)
-
-                # Create the state vector without the exogenous processes
-                state_without_exog = [period, lagged_choice] + endog_states
-
-                # Transform to dictionary to call sparsity function from user
-                state_dict_without_exog = {
-                    states_names_without_exog[i]: state_value
-                    for i, state_value in enumerate(state_without_exog)
-                }
+    # Span all combinations of period, endogenous states and lagged choice. The
+    # ordering is period first, then endogenous states and lagged choice last.
+    endog_state_space = np.array(
+        [add_endog_state_func(endog_id) for endog_id in range(n_endog_states)],
+        dtype=np.int64,
+    ).reshape(n_endog_states, len(endog_states_names))
+    periods, endog_state_ids, lagged_choices = (
+        grid.ravel()
+        for grid in np.meshgrid(
+            np.arange(n_periods),
+            np.arange(n_endog_states),
+            np.arange(n_choices),
+            indexing="ij",
+        )
+    )
+    state_space_wo_exog_candidates = np.column_stack(
+        (periods, lagged_choices, endog_state_space[endog_state_ids])
+    )
 
-                # Check if the state is valid by calling the sparsity function
-                is_state_valid = sparsity_func(**state_dict_without_exog)
-                if not is_state_valid:
-                    continue
-                else:
-                    state_space_wo_exog_list += [state_without_exog]
+    # Check which states are valid by calling the sparsity function of the user
+    is_state_valid = np.array(
+        [
+            sparsity_func(**dict(zip(states_names_without_exog, state_without_exog)))
+            for state_without_exog in state_space_wo_exog_candidates.tolist()
+        ],
+        dtype=bool,
+    )
+    state_space_wo_exog = state_space_wo_exog_candidates[is_state_valid]
 
     n_exog_states = exog_state_space_raw.shape[0]
 
-    state_space_wo_exog = np.array(state_space_wo_exog_list)
     state_space_wo_exog_full = np.repeat(state_space_wo_exog, n_exog_states, axis=0)
     exog_state_space_full = np.tile(
         exog_state_space_raw, (state_space_wo_exog.shape[0], 1)
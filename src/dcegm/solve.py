@@ -330,42 +330,48 @@ def backward_induction(
 
 
 def create_solution_container(n_state_choices, options, has_second_continuous_state):
-    """Create solution containers for value, policy, and endog_grid."""
+    """Create solution containers for value, policy, and endog_grid.
+
+    The containers use JAX's default floating point precision, i.e. float64 if
+    ``jax_enable_x64`` is set and float32 otherwise.
+
+    """
 
     n_total_wealth_grid = options["tuning_params"]["n_total_wealth_grid"]
+    dtype = jax.dtypes.canonicalize_dtype(jnp.float64)
 
     if has_second_continuous_state:
         n_second_continuous_grid = options["tuning_params"]["n_second_continuous_grid"]
 
         value_solved = jnp.full(
             (n_state_choices, n_second_continuous_grid, n_total_wealth_grid),
-            dtype=jnp.float64,
+            dtype=dtype,
             fill_value=jnp.nan,
         )
         policy_solved = jnp.full(
             (n_state_choices, n_second_continuous_grid, n_total_wealth_grid),
-            dtype=jnp.float64,
+            dtype=dtype,
             fill_value=jnp.nan,
         )
         endog_grid_solved = jnp.full(
             (n_state_choices, n_second_continuous_grid, n_total_wealth_grid),
-            dtype=jnp.float64,
+            dtype=dtype,
             fill_value=jnp.nan,
         )
     else:
         value_solved = jnp.full(
             (n_state_choices, n_total_wealth_grid),
-            dtype=jnp.float64,
+            dtype=dtype,
             fill_value=jnp.nan,
         )
         policy_solved = jnp.full(
             (n_state_choices, n_total_wealth_grid),
-            dtype=jnp.float64,
+            dtype=dtype,
             fill_value=jnp.nan,
         )
         endog_grid_solved = jnp.full(
             (n_state_choices, n_total_wealth_grid),
-            dtype=jnp.float64,
+            dtype=dtype,
             fill_value=jnp.nan,
         )
 
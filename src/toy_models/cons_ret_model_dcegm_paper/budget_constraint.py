@@ -101,9 +101,9 @@ def _calc_stochastic_income(
     age = period + min_age
 
     # Determinisctic component of income depending on experience:
-    # constant + alpha_1 * age + alpha_2 * age**2
-    exp_coeffs = jnp.array([constant, exp, exp_squared])
-    labor_income = exp_coeffs @ (age ** jnp.arange(len(exp_coeffs)))
+    # constant + alpha_1 * age + alpha_2 * age**2, evaluated in Horner form to avoid
+    # building the powers of age.
+    labor_income = constant + age * (exp + age * exp_squared)
     working_income = jnp.exp(labor_income + wage_shock)
 
     return (1 - lagged_choice) * working_income
@@ -0,0 +1,183 @@
+import jax
+import jax.numpy as jnp
+import numpy as np
+from numpy.testing import assert_array_almost_equal as aaae
+
+from dcegm.egm.aggregate_marginal_utility import (
+    aggregate_marg_utils_and_exp_values,
+    calculate_choice_probs_and_unsqueezed_logsum,
+)
+
+
+def _aggregate_with_nans(
+    value_state_choice_specific,
+    marg_util_state_choice_specific,
+    reshape_state_choice_vec_to_mat,
+    taste_shock_scale,
+    income_shock_weights,
+):
+    """Aggregate choices with nan-aware NumPy reductions as a reference."""
+    n_state_choices = value_state_choice_specific.shape[0]
+    is_feasible = reshape_state_choice_vec_to_mat.astype(np.int64) < n_state_choices
+    idx = np.where(is_feasible, reshape_state_choice_vec_to_mat, 0)
+
+    choice_values = np.where(
+        is_feasible[..., None, None], value_state_choice_specific[idx], np.nan
+    )
+    choice_marg_utils = np.where(
+        is_feasible[..., None, None], marg_util_state_choice_specific[idx], np.nan
+    )
+
+    max_value = np.nanmax(choice_values, axis=1, keepdims=True)
+    exp_values = np.exp((choice_values - max_value) / taste_shock_scale)
+    sum_exp = np.nansum(exp_values, axis=1, keepdims=True)
+    choice_probs = exp_values / sum_exp
+
+    log_sum = np.squeeze(max_value + taste_shock_scale * np.log(sum_exp), axis=1)
+    marg_util = np.nansum(choice_probs * choice_marg_utils, axis=1)
+
+    return marg_util @ income_shock_weights, log_sum @ income_shock_weights
+
+
+def test_aggregate_with_smallest_int_dtype_indexer():
+    """All choices are feasible and the number of state choices overflows uint8."""
+    n_states, n_choices, n_savings, n_shocks = 128, 2, 5, 3
+    n_state_choices = n_states * n_choices
+
+    rng = np.random.default_rng(1234)
+    value = rng.uniform(0.5, 1.5, size=(n_state_choices, n_savings, n_shocks))
+    marg_util = rng.uniform(0.5, 2.5, size=(n_state_choices, n_savings, n_shocks))
+    income_shock_weights = np.full(n_shocks, 1 / n_shocks)
+
+    reshape_state_choice_vec_to_mat = np.arange(
+        n_state_choices, dtype=np.uint8
+    ).reshape(n_states, n_choices)
+
+    marg_util_aggr, emax = aggregate_marg_utils_and_exp_values(
+        value_state_choice_specific=jnp.asarray(value),
+        marg_util_state_choice_specific=jnp.asarray(marg_util),
+        reshape_state_choice_vec_to_mat=jnp.asarray(reshape_state_choice_vec_to_mat),
+        taste_shock_scale=0.3,
+        income_shock_weights=jnp.asarray(income_shock_weights),
+    )
+    marg_util_expected, emax_expected = _aggregate_with_nans(
+        value,
+        marg_util,
+        reshape_state_choice_vec_to_mat,
+        0.3,
+        income_shock_weights,
+    )
+
+    aaae(marg_util_aggr, marg_util_expected)
+    aaae(emax, emax_expected)
+
+
+def test_aggregate_with_infeasible_choices_out_of_bounds():
+    """Infeasible choices carry an out of bounds index and are clamped in the take."""
+    n_state_choices, n_savings, n_shocks = 9, 5, 2
+    out_of_bounds_idx = n_state_choices + 1
+
+    rng = np.random.default_rng(42)
+    value = rng.uniform(0.5, 1.5, size=(n_state_choices, n_savings, n_shocks))
+    marg_util = rng.uniform(0.5, 2.5, size=(n_state_choices, n_savings, n_shocks))
+    income_shock_weights = np.array([0.4, 0.6])
+
+    reshape_state_choice_vec_to_mat = np.array(
+        [
+            [0, 1, 2],
+            [3, 4, out_of_bounds_idx],
+            [5, out_of_bounds_idx, 6],
+            [out_of_bounds_idx, 7, 8],
+        ],
+        dtype=np.uint8,
+    )
+
+    marg_util_aggr, emax = aggregate_marg_utils_and_exp_values(
+        value_state_choice_specific=jnp.asarray(value),
+        marg_util_state_choice_specific=jnp.asarray(marg_util),
+        reshape_state_choice_vec_to_mat=jnp.asarray(reshape_state_choice_vec_to_mat),
+        taste_shock_scale=0.5,
+        income_shock_weights=jnp.asarray(income_shock_weights),
+    )
+    marg_util_expected, emax_expected = _aggregate_with_nans(
+        value,
+        marg_util,
+        reshape_state_choice_vec_to_mat,
+        0.5,
+        income_shock_weights,
+    )
+
+    assert np.all(np.isfinite(marg_util_aggr))
+    aaae(marg_util_aggr, marg_util_expected)
+    aaae(emax, emax_expected)
+
+
+def test_choice_probs_with_infeasible_choices():
+    """Infeasible choices have NaN values and keep a NaN probability."""
+    choice_values = jnp.array(
+        [
+            [1.0, 2.0, 0.5],
+            [1.0, jnp.nan, 3.0],
+            [jnp.nan, jnp.nan, 2.0],
+            [jnp.nan, jnp.nan, jnp.nan],
+        ]
+    )
+    taste_shock_scale = 0.5
+
+    choice_probs, max_value, sum_exp = calculate_choice_probs_and_unsqueezed_logsum(
+        choice_values_per_state=choice_values, taste_shock_scale=taste_shock_scale
+    )
+
+    is_infeasible = np.isnan(choice_values)
+    assert np.all(np.isnan(choice_probs[is_infeasible]))
+    aaae(np.nansum(choice_probs[:3], axis=1), np.ones(3))
+
+    exp_values = np.exp(np.array([1.0, 3.0]) / taste_shock_scale)
+    aaae(choice_probs[1, [0, 2]], exp_values / exp_values.sum())
+    aaae(max_value[:3, 0], [2.0, 3.0, 2.0])
+
+    # A state without any feasible choice has no well defined probabilities.
+    assert max_value[3, 0] == -np.inf
+    assert sum_exp[3, 0] == 0
+    assert np.all(np.isnan(choice_probs[3]))
+
+
+def test_choice_probs_gradient_with_all_infeasible_state():
+    """A state without feasible choices does not spread NaNs into the gradient."""
+    choice_values = jnp.array([[1.0, jnp.nan, 3.0], [jnp.nan, jnp.nan, jnp.nan]])
+
+    def prob_of_feasible_choice(taste_shock_scale):
+        choice_probs, _, _ = calculate_choice_probs_and_unsqueezed_logsum(
+            choice_values_per_state=choice_values,
+            taste_shock_scale=taste_shock_scale,
+        )
+        return choice_probs[0, 0]
+
+    assert np.isfinite(jax.grad(prob_of_feasible_choice)(0.5))
+
+
+def test_aggregate_gradient_with_padding_state():
+    """A padding state without feasible choices keeps the gradient finite."""
+    n_state_choices, n_savings, n_shocks = 4, 3, 2
+    out_of_bounds_idx = n_state_choices + 1
+
+    rng = np.random.default_rng(7)
+    value = jnp.asarray(rng.uniform(0.5, 1.5, size=(n_state_choices, n_savings, 2)))
+    marg_util = jnp.asarray(rng.uniform(0.5, 2.5, size=value.shape))
+    income_shock_weights = jnp.full(n_shocks, 1 / n_shocks)
+
+    reshape_state_choice_vec_to_mat = jnp.array(
+        [[0, 1], [2, 3], [out_of_bounds_idx, out_of_bounds_idx]], dtype=jnp.uint8
+    )
+
+    def aggregate_sum(taste_shock_scale):
+        marg_util_aggr, emax = aggregate_marg_utils_and_exp_values(
+            value_state_choice_specific=value,
+            marg_util_state_choice_specific=marg_util,
+            reshape_state_choice_vec_to_mat=reshape_state_choice_vec_to_mat,
+            taste_shock_scale=taste_shock_scale,
+            income_shock_weights=income_shock_weights,
+        )
+        return marg_util_aggr.sum() + emax.sum()
+
+    assert np.isfinite(jax.grad(aggregate_sum)(0.5))
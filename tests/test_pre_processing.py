@@ -1,8 +1,12 @@
+from pathlib import Path
+
 import jax.numpy as jnp
 import numpy as np
+import pandas as pd
 import pytest
 from jax import vmap
 
+from dcegm.pre_processing.batches import stack_with_padding
 from dcegm.pre_processing.model_functions import process_model_functions
 from dcegm.pre_processing.params import process_params
 from dcegm.pre_processing.setup_model import (
@@ -24,6 +28,11 @@ from toy_models.cons_ret_model_dcegm_paper.utility_functions_log_crra import (
     utiility_log_crra,
 )
 
+# Obtain the test directory of the package
+TEST_DIR = Path(__file__).parent
+
+REPLICATION_TEST_RESOURCES_DIR = TEST_DIR / "resources" / "replication_tests"
+
 
 def get_next_experience(period, lagged_choice, experience, options, params):
 
@@ -119,6 +128,34 @@ def test_missing_parameter(
         process_params(params)
 
 
+def test_params_from_dataframe():
+    params_df = pd.read_csv(
+        REPLICATION_TEST_RESOURCES_DIR / "deaton" / "params.csv",
+        index_col=["category", "name"],
+    )
+
+    params_dict = process_params(params_df)
+
+    assert isinstance(params_dict, dict)
+    assert params_dict["beta"] == params_df.loc[("beta", "beta"), "value"]
+    assert params_dict["rho"] == params_df.loc[("utility_function", "rho"), "value"]
+
+    # Names which appear in two categories would collapse to a single entry.
+    clashing_params = pd.concat(
+        [
+            params_df,
+            pd.DataFrame(
+                {"value": [0.5]},
+                index=pd.MultiIndex.from_tuples(
+                    [("pension", "rho")], names=["category", "name"]
+                ),
+            ),
+        ]
+    )
+    with pytest.raises(ValueError, match="rho"):
+        process_params(clashing_params)
+
+
 @pytest.mark.parametrize(
     "model_name",
     [
@@ -282,3 +319,23 @@ def test_second_continuous_state(period, lagged_choice, continuous_state):
     )
 
     np.testing.assert_allclose(got, expected)
+
+
+def test_stack_with_padding():
+    arrays = [
+        np.array([[0, 1], [2, 3], [4, 5]]),
+        np.empty((0, 2), dtype=int),
+        np.array([[6, 7]]),
+    ]
+
+    stacked = stack_with_padding(arrays=arrays, fill_value=9)
+
+    expected = np.array(
+        [
+            [[0, 1], [2, 3], [4, 5]],
+            [[9, 9], [9, 9], [9, 9]],
+            [[6, 7], [9, 9], [9, 9]],
+        ]
+    )
+    np.testing.assert_array_equal(stacked, expected)
+    assert stacked.dtype == np.uint8